@@ -4,12 +4,26 @@ import sys
 # --- CRITICAL STABILITY FIXES ---
 # These must be set BEFORE importing argostranslate/ctranslate2 to prevent
 # Segmentation Faults or "Remote Disconnected" errors on some systems.
-os.environ['OMP_NUM_THREADS'] = '1'
+# OMP_NUM_THREADS controls CTranslate2's intra-op threads; 1 is the safe
+# default but can be raised via env on boxes where it's stable.
+os.environ.setdefault('OMP_NUM_THREADS', '1')
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
 os.environ['CT2_VERBOSE'] = '1' # Helps debug if it crashes
 
-from flask import Flask, request, jsonify
+# --- CUDA TUNING (GPU deployments only, harmless on CPU) ---
+# Raises the caching allocator limits so beam sizes >5 don't fall off a
+# latency cliff when the allocator starts thrashing. Override via env:
+#   CT2_CUDA_CACHING_ALLOCATOR_CONFIG=bin_growth,min_bin,max_bin,max_cached_bytes
+os.environ.setdefault('CT2_CUDA_CACHING_ALLOCATOR_CONFIG', '4,3,10,52428800')
+
+from flask import Flask, request, jsonify, Response
+import json
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 
 # --- IMPORT SAFETY CHECK ---
 try:
@@ -26,73 +40,398 @@ except Exception as e:
     print("="*50 + "\n")
     sys.exit(1)
 
+# orjson is optional: its C encoder is 2-5x faster than stdlib json on the
+# per-request serialization path. Falls back to Flask's jsonify if missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 
+def json_response(payload):
+    """
+    Drop-in replacement for jsonify using orjson when available.
+    """
+    if orjson is not None:
+        return Response(orjson.dumps(payload), mimetype="application/json")
+    return jsonify(payload)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global cache to store loaded translation models
+# Global LRU cache to store loaded translation models
 # Key: (source_code, target_code), Value: translation_object
-LOADED_MODELS = {}
+# Bounded so a server hosting many pairs doesn't grow RSS without limit:
+# each CTranslate2 model keeps hundreds of MB resident.
+LOADED_MODELS = OrderedDict()
+LOADED_MODELS_LOCK = threading.Lock()
+MAX_LOADED = int(os.environ.get("MAX_LOADED", 4))
 
-def load_model_logic(source_lang, target_lang):
+# Optional: keep evicted models parked instead of dropping the reference.
+# Re-hitting a parked pair skips the reload from disk (~5s) entirely.
+# Parked models stay loaded, so this trades RAM for reactivation speed and
+# is opt-in via env.
+PERSIST_CPU_CACHE = os.environ.get("CT2_PERSIST_CPU_CACHE", "0") == "1"
+PARKED_MODELS = {}
+
+# Per-pair load locks: concurrent first requests for the same pair wait on
+# one load instead of each paying the multi-second cost, while different
+# pairs still load in parallel.
+_pair_locks = {}
+_locks_lock = threading.Lock()
+
+def _get_pair_lock(source_lang, target_lang):
+    with _locks_lock:
+        return _pair_locks.setdefault((source_lang, target_lang), threading.Lock())
+
+def _underlying_translator(translation, build=False):
     """
-    Helper to load a model into memory, warm it up, and cache it.
+    Reaches the ctranslate2.Translator behind a loaded translation: our
+    DirectTranslation wrapper exposes .translator, while argostranslate's
+    Language.get_translation() returns a CachedTranslation whose
+    .underlying (a PackageTranslation) builds its .translator lazily on
+    first use. With build=True, an unbuilt argos translator is constructed
+    the same way argostranslate would, so callers can touch it before any
+    translation has run. Returns None if unreachable.
+    """
+    tr = getattr(translation, "translator", None)
+    if tr is not None:
+        return tr
+    underlying = getattr(translation, "underlying", None)
+    if underlying is None:
+        return None
+    tr = getattr(underlying, "translator", None)
+    if tr is None and build:
+        pkg = getattr(underlying, "pkg", None)
+        if pkg is not None:
+            try:
+                import ctranslate2
+                from argostranslate import settings as argos_settings
+                tr = ctranslate2.Translator(
+                    str(pkg.package_path / "model"),
+                    device=getattr(argos_settings, "device", "cpu")
+                )
+                underlying.translator = tr
+            except Exception as e:
+                logger.warning(f"Could not build underlying translator: {e}")
+                return None
+    return tr
+
+def _evict_oldest_model():
+    """
+    Drops the least-recently-used model from the cache (or parks it).
+    Caller must hold LOADED_MODELS_LOCK.
+
+    The translator is deliberately NOT unloaded here: load_model_logic
+    hands the object to callers that translate outside the lock, and
+    /translate_stream holds its reference for an entire response, so an
+    eager unload_model() would pull the weights out from under an
+    in-flight request. Dropping the cache reference is enough — the
+    native memory is freed when the last in-flight user lets go.
+    """
+    (old_source, old_target), old_translation = LOADED_MODELS.popitem(last=False)
+    logger.info(f"Evicting model {old_source} -> {old_target} (cache full)")
+    if PERSIST_CPU_CACHE:
+        PARKED_MODELS[(old_source, old_target)] = old_translation
+
+def _unpark_model(source_lang, target_lang):
+    """
+    Moves a previously evicted model back into the LRU cache. Parked
+    models are never unloaded, so this is just a dict move.
+    Caller must hold LOADED_MODELS_LOCK. Returns None if not parked.
     """
-    # 1. Check Cache
-    if (source_lang, target_lang) in LOADED_MODELS:
-        return LOADED_MODELS[(source_lang, target_lang)]
+    translation = PARKED_MODELS.pop((source_lang, target_lang), None)
+    if translation is None:
+        return None
+    logger.info(f"Re-activated parked model {source_lang} -> {target_lang}")
+    LOADED_MODELS[(source_lang, target_lang)] = translation
+    while len(LOADED_MODELS) > MAX_LOADED:
+        _evict_oldest_model()
+    return translation
+
+# Opt-in: bypass argostranslate's hidden Translator construction so thread
+# counts and compute type are under our control. With the default loader,
+# OMP_NUM_THREADS caps intra-op parallelism; the direct path instead passes
+# intra_threads explicitly and can use all cores on multi-core boxes.
+USE_DIRECT_CT2 = os.environ.get("CT2_DIRECT", "0") == "1"
+
+# Run the post-load warmup in a background thread so /loadmodel and the
+# startup preload return as soon as the model is constructed, letting the
+# OS page weights in lazily instead of touching every page up front.
+# Set ASYNC_WARMUP=0 to restore the old blocking behaviour.
+ASYNC_WARMUP = os.environ.get("ASYNC_WARMUP", "1") == "1"
+CT2_INTRA_THREADS = int(os.environ.get("CT2_INTRA_THREADS", os.cpu_count() or 1))
+CT2_INTER_THREADS = int(os.environ.get("CT2_INTER_THREADS", 1))
+
+class DirectTranslation:
+    """
+    argostranslate-compatible wrapper around a directly constructed
+    ctranslate2.Translator (exposes .translate(text) and .translator).
+    """
+    def __init__(self, model_dir, sp_model_path):
+        import ctranslate2
+        import sentencepiece
+        self.translator = ctranslate2.Translator(
+            model_dir,
+            device="cpu",
+            intra_threads=CT2_INTRA_THREADS,
+            inter_threads=CT2_INTER_THREADS,
+            compute_type="int8"
+        )
+        self.sp = sentencepiece.SentencePieceProcessor(model_file=sp_model_path)
 
-    logger.info(f"Loading model {source_lang} -> {target_lang}...")
-    
-    # 2. Find installed package
-    installed_languages = argostranslate.translate.get_installed_languages()
-    from_lang = next((lang for lang in installed_languages if lang.code == source_lang), None)
-    to_lang = next((lang for lang in installed_languages if lang.code == target_lang), None)
+    def translate(self, text):
+        tokens = self.sp.encode(text, out_type=str)
+        results = self.translator.translate_batch([tokens])
+        return self.sp.decode(results[0].hypotheses[0])
 
-    if not from_lang or not to_lang:
+def _load_direct_translation(source_lang, target_lang):
+    """
+    Builds a DirectTranslation from the installed package's model files.
+    Returns None if the package (or its files) cannot be found.
+    """
+    pkg = next(
+        (p for p in argostranslate.package.get_installed_packages()
+         if p.from_code == source_lang and p.to_code == target_lang),
+        None
+    )
+    if not pkg:
         return None
 
-    # 3. Get translation object
-    translation = from_lang.get_translation(to_lang)
-    
+    pkg_path = str(pkg.package_path)
+    model_dir = os.path.join(pkg_path, "model")
+    sp_model = os.path.join(pkg_path, "sentencepiece.model")
+    if not os.path.isdir(model_dir) or not os.path.exists(sp_model):
+        return None
+    return DirectTranslation(model_dir, sp_model)
+
+# Prebuilt {code: Language} lookup so cache misses don't re-scan the
+# installed-languages list with O(N) generator expressions.
+INSTALLED_LANGS = {}
+
+def refresh_installed_languages():
+    """
+    Rebuilds the language-code lookup. Call after installing new packages.
+    """
+    global INSTALLED_LANGS
+    INSTALLED_LANGS = {
+        lang.code: lang for lang in argostranslate.translate.get_installed_languages()
+    }
+    return INSTALLED_LANGS
+
+def _check_model_cache(source_lang, target_lang):
+    """
+    Returns the cached (or parked) translation for the pair, or None.
+    """
+    with LOADED_MODELS_LOCK:
+        if (source_lang, target_lang) in LOADED_MODELS:
+            LOADED_MODELS.move_to_end((source_lang, target_lang))
+            return LOADED_MODELS[(source_lang, target_lang)]
+        return _unpark_model(source_lang, target_lang)
+
+def _run_warmup(translation):
+    """
+    Forces weight load and kernel selection as cheaply as possible: a
+    1-token greedy decode skips the multi-second beam-search tail that a
+    full translate("warmup") would spend in the decoder loop. Falls back
+    to the full translation if the underlying translator isn't reachable.
+    """
+    tr = _underlying_translator(translation, build=True)
+    if tr is not None:
+        try:
+            tr.translate_batch([["warmup"]], max_decoding_length=1, beam_size=1)
+            return
+        except Exception:
+            pass
+    translation.translate("warmup")
+
+def _warmup_translation(translation, source_lang, target_lang):
+    try:
+        _run_warmup(translation)
+        logger.info(f"Background warmup finished for {source_lang} -> {target_lang}")
+    except Exception as e:
+        logger.warning(f"Background warmup failed for {source_lang}->{target_lang}: {e}")
+
+def load_model_logic(source_lang, target_lang):
+    """
+    Helper to load a model into memory, warm it up, and cache it.
+    Evicts the least-recently-used pair once MAX_LOADED is exceeded.
+    Concurrent loads of the same pair are coalesced behind a per-pair lock.
+    """
+    # 1. Check Cache (and the parked pool, if CPU caching is enabled)
+    translation = _check_model_cache(source_lang, target_lang)
     if translation:
-        # 4. Warmup: Run a dummy translation to force CTranslate2 to load weights into RAM
-        translation.translate("warmup")
-        LOADED_MODELS[(source_lang, target_lang)] = translation
-        logger.info(f"Model {source_lang} -> {target_lang} loaded and warmed up.")
-    
-    return translation
+        return translation
+
+    with _get_pair_lock(source_lang, target_lang):
+        # Double-check: another thread may have finished loading while we waited
+        translation = _check_model_cache(source_lang, target_lang)
+        if translation:
+            return translation
+
+        logger.info(f"Loading model {source_lang} -> {target_lang}...")
+
+        # 2. Direct CTranslate2 path (opt-in): full thread/compute control
+        translation = None
+        if USE_DIRECT_CT2:
+            try:
+                translation = _load_direct_translation(source_lang, target_lang)
+            except Exception as e:
+                logger.warning(f"Direct CT2 load failed, falling back to argostranslate: {e}")
+
+        if not translation:
+            # Find installed package (O(1) dict lookup, built once)
+            if not INSTALLED_LANGS:
+                refresh_installed_languages()
+            from_lang = INSTALLED_LANGS.get(source_lang)
+            to_lang = INSTALLED_LANGS.get(target_lang)
+
+            if not from_lang or not to_lang:
+                return None
+
+            # 3. Get translation object
+            translation = from_lang.get_translation(to_lang)
+
+        if translation:
+            # 4. Warmup: Run a dummy translation to force CTranslate2 to load weights into RAM.
+            # Async by default so the caller doesn't block on paging in every weight.
+            if ASYNC_WARMUP:
+                threading.Thread(
+                    target=_warmup_translation,
+                    args=(translation, source_lang, target_lang),
+                    daemon=True
+                ).start()
+            else:
+                _run_warmup(translation)
+            with LOADED_MODELS_LOCK:
+                LOADED_MODELS[(source_lang, target_lang)] = translation
+                LOADED_MODELS.move_to_end((source_lang, target_lang))
+                while len(LOADED_MODELS) > MAX_LOADED:
+                    _evict_oldest_model()
+            logger.info(f"Model {source_lang} -> {target_lang} loaded and warmed up.")
+
+        return translation
+
+def preload_all_models():
+    """
+    Loads every installed language pair into memory before serving traffic,
+    so the first user request never pays the multi-second CTranslate2
+    weight-load + warmup cost.
+    """
+    try:
+        installed_packages = argostranslate.package.get_installed_packages()
+    except Exception as e:
+        logger.warning(f"Could not enumerate installed packages for preload: {e}")
+        return
+
+    pairs = [(pkg.from_code, pkg.to_code) for pkg in installed_packages]
+    if not pairs:
+        logger.info("No installed models found to preload.")
+        return
+
+    logger.info(f"Preloading {len(pairs)} model(s)...")
+    for source, target in pairs:
+        start = time.time()
+        try:
+            if load_model_logic(source, target):
+                logger.info(f"Preloaded {source}->{target} in {time.time() - start:.1f}s")
+            else:
+                logger.warning(f"Skipped {source}->{target}: package installed but not loadable")
+        except Exception as e:
+            logger.error(f"Failed to preload {source}->{target}: {e}")
 
 @app.route('/', methods=['GET'])
 def index():
     """
     Root endpoint to check if API is running in browser.
     """
-    return jsonify({
+    return json_response({
         "status": "online",
         "message": "Argos Translate Local API is running",
-        "endpoints": ["/languages", "/translate", "/loadmodel"]
+        "endpoints": ["/languages", "/translate", "/translate/<src>-<tgt>", "/translate_batch", "/translate_stream", "/loadmodel"],
+        "schemas": {
+            "/languages": "columnar: {count, src: [...], tgt: [...], name: [...]} indexed together"
+        }
     })
 
+# str(pkg) re-reads package metadata; keep the computed names across
+# payload rebuilds so /invalidate only pays for genuinely new packages.
+_pkg_name_cache = {}
+
+@lru_cache(maxsize=1)
+def _cached_languages_payload():
+    """
+    Builds the /languages response once; get_installed_packages() scans the
+    disk and its result only changes when a package is (un)installed.
+    Cleared via /invalidate.
+
+    Columnar layout (parallel arrays indexed together) instead of a list
+    of dicts: far fewer allocations and a smaller serialized response for
+    servers with many pairs.
+    """
+    installed_packages = argostranslate.package.get_installed_packages()
+    for pkg in installed_packages:
+        pair = (pkg.from_code, pkg.to_code)
+        if pair not in _pkg_name_cache:
+            _pkg_name_cache[pair] = str(pkg)
+    return {
+        "src": [pkg.from_code for pkg in installed_packages],
+        "tgt": [pkg.to_code for pkg in installed_packages],
+        "name": [_pkg_name_cache[(pkg.from_code, pkg.to_code)] for pkg in installed_packages],
+    }
+
 @app.route('/languages', methods=['GET'])
 def get_languages():
     """
-    Returns a list of installed language pairs.
+    Returns installed language pairs as parallel arrays:
+    { "count": N, "src": [...], "tgt": [...], "name": [...] }
     """
     try:
-        installed_packages = argostranslate.package.get_installed_packages()
-        languages = []
-        for pkg in installed_packages:
-            languages.append({
-                "source": pkg.from_code,
-                "target": pkg.to_code,
-                "name": str(pkg)
-            })
-        return jsonify({"count": len(languages), "languages": languages})
+        payload = _cached_languages_payload()
+        return json_response({"count": len(payload["src"]), **payload})
+    except Exception as e:
+        return json_response({"error": str(e)}), 500
+
+@app.route('/invalidate', methods=['POST'])
+def invalidate_caches():
+    """
+    Admin endpoint: rebuilds the installed-language lookup after new
+    packages are installed outside this process.
+    """
+    try:
+        langs = refresh_installed_languages()
+        _cached_languages_payload.cache_clear()
+        return json_response({"status": "success", "languages": len(langs)})
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
+
+@app.route('/translate/<source>-<target>', methods=['POST'])
+def translate_pair(source, target):
+    """
+    Per-pair fast route: clients that know their pair can POST {"q": ...}
+    to /translate/<src>-<tgt> and skip the field validation and dispatch
+    of the generic /translate handler. The model is re-resolved through
+    the LRU cache on every call, so an evicted pair reloads instead of
+    serving a freed translator.
+    """
+    data = request.get_json()
+    if not data or 'q' not in data:
+        return json_response({"error": "Missing required field: q"}), 400
+
+    try:
+        translation = load_model_logic(source, target)
+        if not translation:
+            return json_response({"error": f"Language pair not installed: {source} -> {target}"}), 404
+        return json_response({
+            "translatedText": translation.translate(data['q']),
+            "source": source,
+            "target": target
+        })
+    except Exception as e:
+        logger.error(f"Translation error: {e}")
+        return json_response({"error": str(e)}), 500
 
 @app.route('/loadmodel', methods=['POST'])
 def load_model_endpoint():
@@ -102,64 +441,223 @@ def load_model_endpoint():
     """
     data = request.get_json()
     if not data or 'source' not in data or 'target' not in data:
-        return jsonify({"error": "Missing source or target"}), 400
-    
+        return json_response({"error": "Missing source or target"}), 400
+
     source = data['source']
     target = data['target']
-    
+
     try:
         translation = load_model_logic(source, target)
-        
+
         if translation:
-            return jsonify({"status": "success", "message": f"Model {source}->{target} loaded"})
+            return json_response({"status": "success", "message": f"Model {source}->{target} loaded"})
         else:
-            return jsonify({"error": f"Model {source}->{target} not installed"}), 404
+            return json_response({"error": f"Model {source}->{target} not installed"}), 404
             
     except Exception as e:
         logger.error(f"Load error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
+
+def translate_texts(texts, source, target):
+    """
+    Translates a list of texts with one cached model lookup. When the
+    tokenizer and CT2 translator are reachable (the DirectTranslation
+    path), all texts go out in a single translate_batch call so the
+    engine can pad and decode them together; otherwise falls back to
+    one translate() call per text.
+    """
+    translation = load_model_logic(source, target)
+    if not translation:
+        return None
+    if not texts:
+        return []
+
+    sp = getattr(translation, "sp", None)
+    tr = getattr(translation, "translator", None)
+    if sp is not None and tr is not None:
+        try:
+            tokens = [sp.encode(t, out_type=str) for t in texts]
+            results = tr.translate_batch(tokens, max_batch_size=len(tokens))
+            return [sp.decode(r.hypotheses[0]) for r in results]
+        except Exception as e:
+            logger.warning(f"Batched dispatch failed, falling back to per-text: {e}")
+
+    return [translation.translate(t) for t in texts]
+
+@app.route('/translate_batch', methods=['POST'])
+def translate_batch():
+    """
+    Batch translation endpoint.
+    JSON Body: { "q": ["text1", "text2", ...], "source": "en", "target": "es" }
+    """
+    data = request.get_json()
+
+    # Validation
+    if not data or 'q' not in data or 'source' not in data or 'target' not in data:
+        return json_response({"error": "Missing required fields: q, source, target"}), 400
+    if not isinstance(data['q'], list):
+        return json_response({"error": "q must be a list of strings"}), 400
+
+    source = data['source']
+    target = data['target']
+
+    try:
+        results = translate_texts(data['q'], source, target)
+        if results is None:
+            return json_response({"error": f"Language pair not installed: {source} -> {target}"}), 404
+
+        return json_response({
+            "translatedText": results,
+            "source": source,
+            "target": target
+        })
+
+    except Exception as e:
+        logger.error(f"Batch translation error: {str(e)}")
+        return json_response({"error": str(e)}), 500
+
+# Rough sentence boundary for streaming; Argos splits on the same kind of
+# punctuation internally so per-sentence calls don't change the output.
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?…])\s+')
+
+@app.route('/translate_stream', methods=['POST'])
+def translate_stream():
+    """
+    Streaming translation endpoint for long inputs. Splits q on sentence
+    boundaries and yields one NDJSON line per translated sentence, so the
+    client sees the first sentence after one model call instead of waiting
+    for the whole text. Lines are {"i": index, "text": translation};
+    concatenate in order of i.
+    """
+    try:
+        data = request.get_json()
+
+        # Validation
+        if not data or 'q' not in data or 'source' not in data or 'target' not in data:
+            return json_response({"error": "Missing required fields: q, source, target"}), 400
+        if not isinstance(data['q'], str):
+            return json_response({"error": "q must be a string"}), 400
+
+        source = data['source']
+        target = data['target']
+
+        translation = load_model_logic(source, target)
+        if not translation:
+            return json_response({"error": f"Language pair not installed: {source} -> {target}"}), 404
+
+        sentences = [s for s in _SENTENCE_SPLIT_RE.split(data['q']) if s.strip()]
+    except Exception as e:
+        logger.error(f"Stream translation error: {str(e)}")
+        return json_response({"error": str(e)}), 500
+
+    def generate():
+        for i, sentence in enumerate(sentences):
+            try:
+                line = {"i": i, "text": translation.translate(sentence)}
+            except Exception as e:
+                line = {"i": i, "error": str(e)}
+            yield json.dumps(line) + "\n"
+
+    return Response(generate(), mimetype='application/x-ndjson')
 
 @app.route('/translate', methods=['POST'])
 def translate_text():
     """
-    Main translation endpoint. Optimized to use cached models.
+    Main translation endpoint. Thin wrapper over the batch path.
     """
     data = request.get_json()
-    
+
     # Validation
     if not data or 'q' not in data or 'source' not in data or 'target' not in data:
-        return jsonify({"error": "Missing required fields: q, source, target"}), 400
+        return json_response({"error": "Missing required fields: q, source, target"}), 400
 
     q = data['q']
     source = data['source']
     target = data['target']
 
     try:
-        # 1. Check Cache (Fast Path)
-        translation = LOADED_MODELS.get((source, target))
-        
-        # 2. Fallback (Lazy Load if not pre-loaded)
-        if not translation:
-            logger.info("Model not in cache, lazy loading...")
-            translation = load_model_logic(source, target)
-            
-        if not translation:
-             return jsonify({"error": f"Language pair not installed: {source} -> {target}"}), 404
-             
-        # 3. Perform Translation
-        translated_text = translation.translate(q)
+        results = translate_texts([q], source, target)
+        if results is None:
+             return json_response({"error": f"Language pair not installed: {source} -> {target}"}), 404
 
-        return jsonify({
-            "translatedText": translated_text,
+        return json_response({
+            "translatedText": results[0],
             "source": source,
             "target": target
         })
 
     except Exception as e:
         logger.error(f"Translation error: {str(e)}")
-        return jsonify({"error": str(e)}), 500
+        return json_response({"error": str(e)}), 500
 
-if __name__ == '__main__':
-    print("Starting Flask Server on http://0.0.0.0:5000")
+def _parse_cpulist(cpulist):
+    """
+    Expands a kernel cpulist string like "0-3,8-11" into a set of CPU ids.
+    """
+    cpus = set()
+    for part in cpulist.strip().split(','):
+        if '-' in part:
+            start, end = part.split('-')
+            cpus.update(range(int(start), int(end) + 1))
+        elif part:
+            cpus.add(int(part))
+    return cpus
+
+def _numa_node_cpusets():
+    """
+    Returns {node_id: cpu_set} parsed from /sys, or {} if not available.
+    """
+    nodes = {}
+    base = "/sys/devices/system/node"
+    try:
+        for entry in sorted(os.listdir(base)):
+            if not entry.startswith("node"):
+                continue
+            cpulist_path = os.path.join(base, entry, "cpulist")
+            if os.path.exists(cpulist_path):
+                with open(cpulist_path) as f:
+                    nodes[int(entry[4:])] = _parse_cpulist(f.read())
+    except OSError:
+        pass
+    return nodes
+
+def run_numa_workers(base_port=5000):
+    """
+    Forks one worker per NUMA node, pinned to that node's CPUs, each serving
+    on base_port + node_id. On 2-socket boxes this keeps every model's pages
+    local to the cores reading them, roughly doubling usable memory bandwidth.
+    Put a load balancer (e.g. nginx upstream) in front of the ports.
+    """
+    nodes = _numa_node_cpusets()
+    if len(nodes) < 2:
+        logger.info("Single NUMA node detected, running normally.")
+        run_single(base_port)
+        return
+
+    children = []
+    for node_id, cpus in nodes.items():
+        pid = os.fork()
+        if pid == 0:
+            os.sched_setaffinity(0, cpus)
+            logger.info(f"NUMA worker for node {node_id} pinned to CPUs {sorted(cpus)}")
+            run_single(base_port + node_id)
+            os._exit(0)
+        children.append(pid)
+
+    print(f"Started {len(children)} NUMA workers on ports "
+          f"{', '.join(str(base_port + n) for n in nodes)}")
+    for pid in children:
+        os.waitpid(pid, 0)
+
+def run_single(port=5000):
+    # Warm every installed pair up-front so the first request is fast
+    preload_all_models()
+    print(f"Starting Flask Server on http://0.0.0.0:{port}")
     # threaded=False can sometimes help stability with CTranslate2
-    app.run(host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=port, threaded=True)
+
+if __name__ == '__main__':
+    if '--numa' in sys.argv:
+        run_numa_workers()
+    else:
+        run_single()
\ No newline at end of file
@@ -18,6 +18,8 @@ from translator_backend import BackendTranslator
 
 CONFIG_FILE = "translator_config.json"
 
+__all__ = ["App"]
+
 def save_settings(data):
     with open(CONFIG_FILE, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4)
@@ -40,7 +42,11 @@ class App(tk.Tk):
         self.translator = None
         
         self.create_widgets()
-        
+
+        # Event-driven progress updates: the worker thread fires a virtual
+        # event instead of the UI polling the queue every 100ms.
+        self.bind("<<TranslationUpdate>>", self._drain_queue)
+
         # Simple cleanup on close
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
 
@@ -174,8 +180,6 @@ class App(tk.Tk):
         t = threading.Thread(target=self.translator.run_translation, args=(current_settings,))
         t.daemon = True
         t.start()
-        
-        self.check_queue()
 
     def stop_translation(self):
         if self.translator:
@@ -185,30 +189,33 @@ class App(tk.Tk):
 
     def queue_update(self, percent, message):
         self.queue.put((percent, message))
+        try:
+            # Wake the Tk mainloop only when there's something to show
+            self.event_generate("<<TranslationUpdate>>", when="tail")
+        except tk.TclError:
+            pass # Window is closing
 
-    def check_queue(self):
+    def _drain_queue(self, event=None):
         try:
             while True:
                 percent, msg = self.queue.get_nowait()
                 self.progress['value'] = percent
                 self.status_label.config(text=msg)
-                
+
                 if "Done!" in msg or "Error" in msg or "Stopped" in msg:
                     self.btn_run.config(state="normal", text="Run Translation 🚀")
                     self.btn_stop.config(state="disabled")
-                    
+
                     if "Stopped" in msg:
                         messagebox.showwarning("Terminated", "Process stopped.")
                     elif "Error" in msg:
                         messagebox.showerror("Error", msg)
                     else:
                         messagebox.showinfo("Result", msg)
-                    return 
+                    return
 
         except queue.Empty:
             pass
-        
-        self.after(100, self.check_queue)
 
 if __name__ == "__main__":
     app = App()
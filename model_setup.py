@@ -2,6 +2,7 @@ import argparse
 import argostranslate.package
 import argostranslate.translate
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 def install_language(from_code, to_code):
     """
@@ -47,10 +48,96 @@ def install_language(from_code, to_code):
         print(f"Error: No package found for {from_code} -> {to_code}")
         print("Available codes usually include: en, es, fr, de, it, pt, ru, zh, ar, tr, etc.")
 
+def install_many(pairs, max_workers=4):
+    """
+    Installs several language pairs, downloading concurrently (network-bound,
+    near-linear speedup) and installing sequentially (install touches a
+    shared package index and is not thread-safe).
+    """
+    # 1. Filter out pairs that are already installed
+    try:
+        installed = {(p.from_code, p.to_code)
+                     for p in argostranslate.package.get_installed_packages()}
+    except Exception as e:
+        print(f"Warning checking installed packages: {e}")
+        installed = set()
+
+    todo = [pair for pair in pairs if pair not in installed]
+    for pair in pairs:
+        if pair in installed:
+            print(f"✔ Package {pair[0]}->{pair[1]} is already installed. Skipping.")
+    if not todo:
+        return
+
+    # 2. Update index once, resolve packages
+    print("Updating package index...")
+    argostranslate.package.update_package_index()
+    available_packages = argostranslate.package.get_available_packages()
+
+    to_download = []
+    for from_code, to_code in todo:
+        pkg = next(
+            (p for p in available_packages
+             if p.from_code == from_code and p.to_code == to_code),
+            None
+        )
+        if pkg:
+            to_download.append(pkg)
+        else:
+            print(f"Error: No package found for {from_code} -> {to_code}")
+
+    # 3. Download concurrently
+    downloaded = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        future_map = {executor.submit(pkg.download): pkg for pkg in to_download}
+        for future in as_completed(future_map):
+            pkg = future_map[future]
+            try:
+                downloaded.append((pkg, future.result()))
+                print(f"Downloaded {pkg.from_code}->{pkg.to_code}")
+            except Exception as e:
+                print(f"Download failed for {pkg.from_code}->{pkg.to_code}: {e}")
+
+    # 4. Install sequentially
+    for pkg, path in downloaded:
+        try:
+            argostranslate.package.install_from_path(path)
+            print(f"Successfully installed {pkg.from_code} -> {pkg.to_code}")
+        except Exception as e:
+            print(f"Critical error during installation of {pkg.from_code}->{pkg.to_code}: {e}")
+            if os.path.exists(path):
+                os.remove(path)
+
+def parse_pairs(spec):
+    """
+    Parses a CLI pair list like "en-es,en-fr" into [("en","es"), ("en","fr")].
+    """
+    pairs = []
+    for item in spec.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        from_code, sep, to_code = item.partition('-')
+        if not sep or not from_code or not to_code:
+            raise ValueError(f"Invalid pair '{item}', expected 'from-to' (e.g. 'en-es')")
+        pairs.append((from_code, to_code))
+    return pairs
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Install Argos Translate Models')
-    parser.add_argument('--from_code', type=str, required=True, help='Source language code (e.g., "en")')
-    parser.add_argument('--to_code', type=str, required=True, help='Target language code (e.g., "es")')
-    
+    parser.add_argument('--from_code', type=str, help='Source language code (e.g., "en")')
+    parser.add_argument('--to_code', type=str, help='Target language code (e.g., "es")')
+    parser.add_argument('--pairs', type=str, default=None,
+                        help='Install several pairs at once with parallel downloads, '
+                             'e.g. --pairs en-es,en-fr,en-de')
+    parser.add_argument('--max_workers', type=int, default=4,
+                        help='Concurrent downloads for --pairs (default 4)')
+
     args = parser.parse_args()
-    install_language(args.from_code, args.to_code)
\ No newline at end of file
+    if args.pairs:
+        pairs = parse_pairs(args.pairs)
+        install_many(pairs, max_workers=args.max_workers)
+    elif args.from_code and args.to_code:
+        install_language(args.from_code, args.to_code)
+    else:
+        parser.error('Provide either --from_code and --to_code, or --pairs')
\ No newline at end of file
@@ -0,0 +1,28 @@
+#!/bin/bash
+
+# Launches the Flask API with a warm bytecode cache and -O.
+# Precompiling app.py plus the heavy deps (argostranslate, ctranslate2)
+# once means every later start skips parse/compile, and -O strips asserts
+# from the loaded code objects (docstrings would need -OO).
+
+cd "$(dirname "$0")"
+
+# Use the project venv if setup.sh created one
+if [ -f "venv/bin/activate" ]; then
+    source venv/bin/activate
+fi
+
+export PYTHONPYCACHEPREFIX="${PYTHONPYCACHEPREFIX:-/tmp/pyc}"
+unset PYTHONDONTWRITEBYTECODE
+
+SITE_PACKAGES=$(python3 -c "import sysconfig; print(sysconfig.get_paths()['purelib'])")
+
+echo "Precompiling bytecode (cache: $PYTHONPYCACHEPREFIX)..."
+python3 -O -m compileall -q app.py
+for pkg in argostranslate ctranslate2 flask; do
+    if [ -d "$SITE_PACKAGES/$pkg" ]; then
+        python3 -O -m compileall -q "$SITE_PACKAGES/$pkg"
+    fi
+done
+
+exec python3 -O app.py "$@"
@@ -1,4 +1,9 @@
+import copy
+import hashlib
 import os
+import random
+import sqlite3
+import string
 import time
 import zipfile
 import html
@@ -16,13 +21,117 @@ try:
 except ImportError:
     print("Argos Translate not found. Please install requirements.")
 
+# Prefer the C-backed lxml parser (5-10x faster than the pure-Python
+# html.parser on typical EPUB chapters); fall back if it's not installed.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+    XML_PARSER = 'lxml-xml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+    XML_PARSER = 'html.parser'
+
+# Max texts per batched API call (DeepL recommends up to 50 per request)
+API_BATCH_SIZE = 50
+
+# Hot-loop constants, hoisted so they aren't rebuilt per chapter/element
+PRIMARY_TAGS = ('p', 'h1', 'h2', 'h3', 'h4', 'h5', 'blockquote')
+# One compiled CSS selection replaces the per-element find_parent('a')
+# walk and class check: exclude elements inside links and our own spans.
+PRIMARY_SELECTOR = ', '.join(f'{t}:not(a {t}):not(.translation-text)' for t in PRIMARY_TAGS)
+_TOC_RE = re.compile(r'toc|nav', re.I)
+# Byte-level "is there anything to translate" probe, run before parsing
+_HAS_WORDS = re.compile(rb'[A-Za-z]{3,}')
+# Deleting all ASCII letters shortens a string iff it contains one; this
+# C-level test replaces a regex scan per element.
+_NONLETTERS = str.maketrans('', '', string.ascii_letters)
+
+# Injected translation markup: one shared <style> per modified chapter and
+# a parsed fragment per span, instead of three tree-mutation calls plus a
+# long inline CSS string on every element.
+_TRANSLATION_STYLE = ('<style>.translation-text{color:#555;font-size:90%;'
+                      'background-color:#f4f4f4;display:block;margin-top:4px;'
+                      'padding:4px;border-radius:4px;}</style>')
+_SPAN_TEMPLATE = '<br/><span class="translation-text">{}</span>'
+
+# On-disk translation cache, keyed by (source engine, target lang, text hash)
+CACHE_DB_FILE = "translation_cache.db"
+
+# Already-compressed formats: deflating these again wastes CPU for ~0% gain
+STORED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp',
+                     '.mp3', '.mp4', '.m4a',
+                     '.woff', '.woff2', '.otf', '.ttf')
+
+def copy_raw_zip_entry(zin, zout, item):
+    """
+    Copies one entry's already-compressed bytes straight from zin to zout,
+    skipping the usual inflate + re-deflate round trip entirely. Returns
+    False (so the caller can fall back to a normal copy) if the zipfile
+    internals don't cooperate.
+    """
+    try:
+        # Locate the compressed payload behind the local file header:
+        # 30 fixed bytes + name + extra field.
+        zin.fp.seek(item.header_offset + 26)
+        lengths = zin.fp.read(4)
+        name_len = int.from_bytes(lengths[0:2], 'little')
+        extra_len = int.from_bytes(lengths[2:4], 'little')
+        zin.fp.seek(item.header_offset + 30 + name_len + extra_len)
+        raw = zin.fp.read(item.compress_size)
+        if len(raw) != item.compress_size:
+            return False
+
+        # Prepare everything fallible up front — the header bytes included
+        # (FileHeader() doesn't depend on header_offset) — so a failure
+        # can't leave a partial local header in zout for the caller's
+        # fallback to write the same entry after.
+        new_info = copy.copy(item)
+        new_info.flag_bits &= ~0x08 # Sizes are known; no data descriptor
+        header = new_info.FileHeader()
+
+        # Re-emit through zout's bookkeeping without recompressing
+        with zout._lock:
+            zout._writecheck(new_info)
+            zout._didModify = True
+            new_info.header_offset = zout.fp.tell()
+            zout.fp.write(header + raw)
+            zout.start_dir = zout.fp.tell()
+            zout.filelist.append(new_info)
+            zout.NameToInfo[new_info.filename] = new_info
+        return True
+    except Exception:
+        return False
+
+# File-level parallelism per translation source
+MAX_WORKERS_BY_SOURCE = {
+    "deepl": 16,
+    "google_free": 8,
+    "gemini": 4,
+    "local": 1,
+}
+
 class BackendTranslator:
     def __init__(self, update_callback=None):
         self.callback = update_callback
         self.stop_requested = False
         self.counter_lock = threading.Lock()
         self.total_translated_count = 0
-        self.argos_model = None # Stores the loaded model
+        self.argos_model = None # Stores the loaded model (argos wrapper fallback)
+        self._ct2 = None        # Direct CTranslate2 translator, when available
+        self._sp = None         # SentencePiece tokenizer for the direct path
+        # Shared rate limiter state (see _throttle)
+        self._rate_lock = threading.Lock()
+        self._last_call_ts = 0.0
+        # Translation cache: books repeat headings/names/boilerplate, so
+        # duplicates become a dict lookup. The sqlite layer persists across
+        # runs (re-running a book after a crash costs no repeat API calls).
+        self._mem_cache = {}
+        self._cache_lock = threading.Lock()
+        self._db = None
+        # Caps in-flight API calls; re-sized per source in run_translation
+        self._api_semaphore = threading.Semaphore(16)
+        # Serializes batched local inference so parse workers can run ahead
+        self._local_infer_lock = threading.Lock()
 
     def log(self, percent, message):
         if self.callback:
@@ -70,8 +179,13 @@ class BackendTranslator:
             else:
                 raise Exception(f"No model found for {source_code}->{target_code}")
 
-        # 3. Load Model
+        # 3. Load Model: prefer direct CTranslate2 (int8, own thread pool),
+        # fall back to the argostranslate wrapper.
         self.log(0, "Loading model into memory...")
+        if self._load_ct2_direct(source_code, target_code):
+            self.log(0, "Model loaded (direct CTranslate2, int8) and ready.")
+            return
+
         installed_languages = argostranslate.translate.get_installed_languages()
         from_lang = next((lang for lang in installed_languages if lang.code == source_code), None)
         to_lang = next((lang for lang in installed_languages if lang.code == target_code), None)
@@ -84,6 +198,238 @@ class BackendTranslator:
         else:
             raise Exception("Failed to load translation model after installation.")
 
+    def _load_ct2_direct(self, source_code, target_code):
+        """
+        Bypasses the argostranslate Python wrapper: loads the installed
+        package's CTranslate2 model directly with int8 compute (2-4x CPU
+        throughput, half the memory) and the bundled SentencePiece
+        tokenizer. Returns True on success.
+        """
+        try:
+            import ctranslate2
+            import sentencepiece
+
+            pkg = next(
+                (p for p in argostranslate.package.get_installed_packages()
+                 if p.from_code == source_code and p.to_code == target_code),
+                None
+            )
+            if not pkg:
+                return False
+
+            pkg_path = str(pkg.package_path)
+            model_dir = os.path.join(pkg_path, "model")
+            sp_model = os.path.join(pkg_path, "sentencepiece.model")
+            if not os.path.isdir(model_dir) or not os.path.exists(sp_model):
+                return False
+
+            cpu = os.cpu_count() or 2
+            self._ct2 = ctranslate2.Translator(
+                model_dir,
+                device="cpu",
+                compute_type="int8",
+                intra_threads=max(1, cpu // 2),
+                inter_threads=2
+            )
+            self._sp = sentencepiece.SentencePieceProcessor(model_file=sp_model)
+            # Warmup
+            self._ct2.translate_batch([self._sp.encode("warmup", out_type=str)])
+            return True
+        except Exception as e:
+            self.log(0, f"Direct CT2 load unavailable ({str(e)[:40]}), using argos wrapper.")
+            return False
+
+    def _translate_local(self, text):
+        """Local-model translation via the fastest loaded path."""
+        if self._ct2:
+            tokens = self._sp.encode(text, out_type=str)
+            results = self._ct2.translate_batch([tokens])
+            return self._sp.decode(results[0].hypotheses[0])
+        if self.argos_model:
+            return self.argos_model.translate(text)
+        return None
+
+    def _translate_local_batch(self, texts):
+        """
+        Translates a whole chapter's texts in one batched CT2 call, letting
+        the engine amortize attention/softmax over the batch dimension
+        instead of paying Python dispatch per element.
+        """
+        encoded = [self._sp.encode(t, out_type=str) for t in texts]
+        results = self._ct2.translate_batch(encoded, max_batch_size=32, beam_size=2)
+        return [self._sp.decode(r.hypotheses[0]) for r in results]
+
+    def _throttle(self, min_interval):
+        """
+        Enforces a minimum spacing between API calls across all worker
+        threads. Unlike a fixed sleep, this only waits when the previous
+        call was too recent, so throughput isn't capped when we're already
+        under the limit.
+        """
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._last_call_ts + min_interval - now
+            if wait > 0:
+                time.sleep(wait)
+            self._last_call_ts = time.monotonic()
+
+    def _cache_db(self):
+        """Lazily opens the on-disk cache (shared across worker threads)."""
+        with self._cache_lock:
+            if self._db is None:
+                self._db = sqlite3.connect(CACHE_DB_FILE, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute("PRAGMA synchronous=NORMAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    " source TEXT, lang TEXT, hash BLOB, translation TEXT,"
+                    " PRIMARY KEY (source, lang, hash))"
+                )
+            return self._db
+
+    def _cache_key(self, text, cfg):
+        return (cfg.get("source", "google_free"),
+                cfg.get("language", "tr"),
+                hashlib.sha1(text.encode('utf-8')).digest())
+
+    def _cache_get(self, text, cfg):
+        key = self._cache_key(text, cfg)
+        with self._cache_lock:
+            if key in self._mem_cache:
+                return self._mem_cache[key]
+        try:
+            db = self._cache_db()
+            with self._cache_lock:
+                row = db.execute(
+                    "SELECT translation FROM translations WHERE source=? AND lang=? AND hash=?",
+                    key
+                ).fetchone()
+            if row:
+                with self._cache_lock:
+                    self._mem_cache[key] = row[0]
+                return row[0]
+        except Exception:
+            pass
+        return None
+
+    def _cache_put(self, text, cfg, translation):
+        key = self._cache_key(text, cfg)
+        with self._cache_lock:
+            self._mem_cache[key] = translation
+        try:
+            db = self._cache_db()
+            with self._cache_lock:
+                db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                    key + (translation,)
+                )
+                db.commit()
+        except Exception:
+            pass
+
+    def _call_with_backoff(self, fn, max_attempts=3, base=0.5, cap=8.0):
+        """
+        Runs fn(), retrying transient failures (rate limits, quota,
+        timeouts) with exponential backoff plus a little jitter so retries
+        from parallel workers don't re-collide. Non-transient errors and
+        the final failed attempt raise to the caller.
+        """
+        for attempt in range(max_attempts):
+            try:
+                return fn()
+            except Exception as e:
+                msg = str(e).lower()
+                transient = any(k in msg for k in ("429", "rate", "quota", "timeout", "temporar", "connection"))
+                if not transient or attempt == max_attempts - 1:
+                    raise
+                wait = min(cap, base * (2 ** attempt)) + random.uniform(0, 0.25)
+                time.sleep(wait)
+
+    def translate_batch_api(self, texts, cfg):
+        """
+        Cache-aware batch translation: serves duplicates from the cache and
+        only sends texts the book hasn't produced before to the API.
+        """
+        if not texts: return []
+
+        results = [None] * len(texts)
+        missing = []
+        for i, text in enumerate(texts):
+            cached = self._cache_get(text, cfg)
+            if cached is not None:
+                results[i] = cached
+            else:
+                missing.append(i)
+
+        if missing:
+            fresh = self._translate_batch_uncached([texts[i] for i in missing], cfg)
+            for i, trans_text in zip(missing, fresh):
+                results[i] = trans_text
+                if trans_text and not trans_text.startswith("[Error"):
+                    self._cache_put(texts[i], cfg, trans_text)
+        return results
+
+    def _translate_batch_uncached(self, texts, cfg):
+        """
+        Translates a list of texts in one API round-trip where the backend
+        supports it (DeepL and deep_translator accept lists; Gemini gets a
+        separator-joined block). Falls back to per-text calls on failure.
+        """
+        if not texts: return []
+
+        source = cfg.get("source", "google_free")
+        target_lang = cfg.get("language", "tr")
+
+        # Local model: one batched inference call, no rate limiting needed.
+        # The lock keeps a single batch on the engine at a time; other
+        # workers keep parsing/inflating while they wait their turn.
+        if source == "local" and self._ct2:
+            try:
+                with self._local_infer_lock:
+                    return self._translate_local_batch(texts)
+            except Exception as e:
+                self.log(0, f"Batched local inference failed ({str(e)[:40]}), retrying per text...")
+                return [self.translate_text_api(t, cfg) for t in texts]
+
+        try:
+            with self._api_semaphore:
+                if source == "deepl":
+                    import deepl
+                    translator = deepl.Translator(cfg["deepl_key"])
+                    self._throttle(0.02) # Stay under ~50 RPS
+                    results = self._call_with_backoff(
+                        lambda: translator.translate_text(texts, target_lang=target_lang, preserve_formatting=True))
+                    return [r.text for r in results]
+
+                elif source == "google_free":
+                    from deep_translator import GoogleTranslator
+                    return self._call_with_backoff(
+                        lambda: GoogleTranslator(source='auto', target=target_lang).translate_batch(texts))
+
+                elif source == "gemini":
+                    import google.generativeai as genai
+                    genai.configure(api_key=cfg["gemini_key"])
+                    model = genai.GenerativeModel("gemini-pro")
+                    # U+241E is vanishingly rare in book text, so it survives
+                    # translation as a separator we can split on.
+                    sep = "\n␞\n"
+                    self._throttle(0.2)
+                    response = self._call_with_backoff(
+                        lambda: model.generate_content(
+                            f"Translate to {target_lang}. Keep every ␞ separator. "
+                            f"Output only text:\n{sep.join(texts)}"
+                        ))
+                    parts = [p.strip() for p in (response.text or "").split("␞")]
+                    if len(parts) == len(texts):
+                        return parts
+                    # Separator was mangled; fall through to per-text calls
+
+        except Exception as e:
+            self.log(0, f"Batch call failed ({str(e)[:40]}), retrying per text...")
+
+        # Per-text fallback (also the path for the local model)
+        return [self.translate_text_api(t, cfg) for t in texts]
+
     def translate_text_api(self, text, cfg):
         """Routes text to the correct API"""
         if not text: return None
@@ -94,88 +440,165 @@ class BackendTranslator:
         try:
             # --- OPTION 1: LOCAL (DIRECT) ---
             if source == "local":
-                if self.argos_model:
-                    return self.argos_model.translate(text)
-                else:
-                    return "[Error: Model not loaded]"
+                result = self._translate_local(text)
+                return result if result is not None else "[Error: Model not loaded]"
 
             # --- OPTION 2: DEEPL ---
             elif source == "deepl":
                 import deepl
                 translator = deepl.Translator(cfg["deepl_key"])
-                result = translator.translate_text(text, target_lang=target_lang, preserve_formatting=True)
+                self._throttle(0.02) # Stay under ~50 RPS
+                result = self._call_with_backoff(
+                    lambda: translator.translate_text(text, target_lang=target_lang, preserve_formatting=True))
                 return result.text
-            
+
             # --- OPTION 3: GEMINI ---
             elif source == "gemini":
                 import google.generativeai as genai
                 genai.configure(api_key=cfg["gemini_key"])
                 model = genai.GenerativeModel("gemini-pro")
-                response = model.generate_content(f"Translate to {target_lang}. Output only text: {text}")
-                time.sleep(0.5) 
+                self._throttle(0.2)
+                response = self._call_with_backoff(
+                    lambda: model.generate_content(f"Translate to {target_lang}. Output only text: {text}"))
                 return response.text.strip() if response.text else None
-            
+
             # --- OPTION 4: GOOGLE FREE ---
             elif source == "google_free":
                 from deep_translator import GoogleTranslator
-                for _ in range(3):
-                    try:
-                        return GoogleTranslator(source='auto', target=target_lang).translate(text)
-                    except:
-                        time.sleep(1)
-                raise Exception("Connection timeout")
+                return self._call_with_backoff(
+                    lambda: GoogleTranslator(source='auto', target=target_lang).translate(text))
                 
         except Exception as e:
             return f"[Error: {str(e)[:20]}...]"
         return text
 
-    def _process_single_file(self, filename, raw_data, settings):
-        """Worker function"""
-        if self.stop_requested: return filename, raw_data, False
-        if 'toc' in filename.lower() or 'nav' in filename.lower(): return filename, raw_data, False
-
+    @staticmethod
+    def _select_candidates(soup):
+        """
+        Returns the chapter's translatable (element, text) pairs. Tag,
+        ancestor-link and class filters run inside the compiled CSS query
+        (one C traversal when lxml/soupsieve are present); only the cheap
+        text-level length/letter checks remain per element in Python.
+        """
         try:
-            content = raw_data.decode('utf-8')
-        except:
-            content = raw_data.decode('latin-1', errors='ignore')
+            elements = soup.select(PRIMARY_SELECTOR)
+        except Exception:
+            elements = [el for el in soup.find_all(PRIMARY_TAGS)
+                        if not (el.find_parent('a') or "translation-text" in el.get('class', []))]
+
+        candidates = []
+        append = candidates.append
+        nonletters = _NONLETTERS
+        for el in elements:
+            text = el.get_text().strip()
+            if len(text) > 2 and len(text.translate(nonletters)) != len(text):
+                append((el, text))
+        return candidates
+
+    def _prescan_and_translate(self, zin, file_list, settings, max_workers):
+        """
+        First pass over the whole book: collect every unique translatable
+        string, then translate each exactly once through the batched,
+        cached API path. The per-file pass afterwards substitutes from the
+        cache, so duplicates across chapters (headings, names, boilerplate
+        - often 20-40% of a book) never cost a second API call and the
+        API sees smooth, maximally-batched traffic.
+        """
+        unique = {}
+        for fname in file_list:
+            if self.stop_requested: return
+            if _TOC_RE.search(fname): continue
+            raw_data = zin.read(fname)
+            if not _HAS_WORDS.search(raw_data): continue
+
+            content = raw_data.decode('utf-8', errors='replace')
+            parser = XML_PARSER if fname.lower().endswith('.xhtml') else HTML_PARSER
+            soup = BeautifulSoup(content, parser)
+            for _, text in self._select_candidates(soup):
+                unique.setdefault(text, None)
+
+        todo = [t for t in unique if self._cache_get(t, settings) is None]
+        if not todo:
+            return
+
+        self.log(0, f"Pre-translating {len(todo)} unique strings "
+                    f"({len(unique) - len(todo)} already cached)...")
+        batches = [todo[i:i + API_BATCH_SIZE] for i in range(0, len(todo), API_BATCH_SIZE)]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.translate_batch_api, batch, settings)
+                       for batch in batches]
+            for i, future in enumerate(as_completed(futures)):
+                if self.stop_requested: return
+                future.result()
+                self.log(0, f"Pre-translated batch {i + 1}/{len(batches)}...")
+
+    def _process_single_file(self, filename, zin, settings):
+        """
+        Worker function. Reads its own entry from the (internally locked)
+        ZipFile so each chapter is inflated exactly once, inside the worker:
+        buffers aren't all materialized up front and zlib releases the GIL
+        while other workers run.
+        """
+        raw_data = zin.read(filename)
+        if self.stop_requested or _TOC_RE.search(filename): return filename, raw_data, False
+
+        # Cheap byte-level pre-filter: a chapter with no Latin words has
+        # nothing to translate, so skip the decode + parse entirely.
+        if not _HAS_WORDS.search(raw_data): return filename, raw_data, False
+
+        # One decode pass: no exception handling on the happy path and no
+        # second full decode of the buffer when a stray byte shows up.
+        content = raw_data.decode('utf-8', errors='replace')
+
+        # .xhtml entries are XML; parse them in XML mode so lxml doesn't
+        # apply HTML recovery rules to well-formed XHTML.
+        parser = XML_PARSER if filename.lower().endswith('.xhtml') else HTML_PARSER
+        soup = BeautifulSoup(content, parser)
 
-        soup = BeautifulSoup(content, 'html.parser')
-        primary_tags = ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'blockquote']
-        elements = soup.find_all(primary_tags)
-        
         modified = False
         test_mode = settings.get("test_mode", False)
         test_limit = int(settings.get("test_limit", 50))
 
-        for el in elements:
+        # Pass 1: collect every element that needs translation
+        candidates = self._select_candidates(soup)
+
+        if test_mode:
+            # Reserve our share of the budget atomically: read-then-slice
+            # without the increment would let every worker see the full
+            # remainder and overshoot the limit by a factor of the pool size.
+            with self.counter_lock:
+                remaining = max(0, test_limit - self.total_translated_count)
+                reserved = min(len(candidates), remaining)
+                self.total_translated_count += reserved
+            candidates = candidates[:reserved]
+
+        # Pass 2: translate in batches of up to API_BATCH_SIZE per round-trip
+        for start in range(0, len(candidates), API_BATCH_SIZE):
             if self.stop_requested: break
-            
-            if test_mode:
-                with self.counter_lock:
-                    if self.total_translated_count >= test_limit: break
 
-            if el.find_parent('a') or "translation-text" in el.get('class', []): continue
-            
-            original_text = el.get_text().strip()
-            if len(original_text) > 2 and re.search('[a-zA-Z]', original_text):
-                
-                trans_text = self.translate_text_api(original_text, settings)
-                
+            batch = candidates[start:start + API_BATCH_SIZE]
+            results = self.translate_batch_api([text for _, text in batch], settings)
+
+            for (el, _), trans_text in zip(batch, results):
                 if trans_text and not trans_text.startswith("[Error"):
-                    if test_mode:
-                        with self.counter_lock: self.total_translated_count += 1
-                    
+                    if not modified:
+                        # First modification: add the shared style rule once
+                        style_tag = BeautifulSoup(_TRANSLATION_STYLE, HTML_PARSER).style
+                        if soup.head is not None:
+                            soup.head.append(style_tag)
+                        else:
+                            soup.insert(0, style_tag)
                     modified = True
-                    br = soup.new_tag("br")
-                    el.append(br)
-                    span = soup.new_tag("span")
-                    span.string = trans_text
-                    span['class'] = "translation-text"
-                    span['style'] = "color: #555; font-size: 90%; background-color: #f4f4f4; display: block; margin-top: 4px; padding: 4px; border-radius: 4px;"
-                    el.append(span)
+
+                    fragment = BeautifulSoup(
+                        _SPAN_TEMPLATE.format(html.escape(trans_text)), HTML_PARSER)
+                    el.append(fragment.br)
+                    el.append(fragment.span)
 
         if modified:
-            return filename, soup.decode(formatter='minimal').encode('utf-8'), True
+            # One tree walk straight to bytes; the decode().encode() round
+            # trip materialized the whole document as str first
+            return filename, soup.encode('utf-8', formatter='minimal'), True
         return filename, raw_data, False
 
     def run_translation(self, settings):
@@ -197,45 +620,101 @@ class BackendTranslator:
         output_path = f"{root}_translated_{settings['language']}.epub"
         
         # Helper for mobi conversion
+        temp_paths = [] # Converted/extracted intermediates, removed in finally
         if ext.lower() in ['.mobi', '.azw3']:
             self.log(0, f"Converting {ext} to EPUB...")
-            temp_epub = f"{root}_temp_converted.epub"
+            converted = None
+
+            # Fast path: post-2011 files usually embed a KF8/EPUB section
+            # that the mobi package extracts directly, skipping the
+            # 30s+ Calibre process fork and full re-pack.
             try:
-                subprocess.run(["ebook-convert", input_path, temp_epub], check=True, capture_output=True)
-                input_path = temp_epub
-            except:
-                self.log(0, "Error: Calibre ebook-convert not found.")
-                return
+                import mobi
+                tempdir, extracted = mobi.extract(input_path)
+                if extracted.lower().endswith('.epub'):
+                    converted = extracted
+                    temp_paths.append(tempdir)
+                else:
+                    shutil.rmtree(tempdir, ignore_errors=True)
+            except ImportError:
+                pass
+            except Exception as e:
+                self.log(0, f"Direct extraction failed ({str(e)[:40]}), using Calibre...")
+
+            if not converted:
+                temp_epub = f"{root}_temp_converted.epub"
+                try:
+                    subprocess.run(["ebook-convert", input_path, temp_epub],
+                                   check=True, capture_output=True, timeout=120)
+                    converted = temp_epub
+                    temp_paths.append(temp_epub)
+                except subprocess.CalledProcessError as e:
+                    stderr = (e.stderr or b'').decode('utf-8', errors='replace')[-200:]
+                    self.log(0, f"Error: ebook-convert failed: {stderr}")
+                    return
+                except subprocess.TimeoutExpired:
+                    self.log(0, "Error: ebook-convert timed out after 120s.")
+                    return
+                except Exception:
+                    self.log(0, "Error: Calibre ebook-convert not found.")
+                    return
+
+            input_path = converted
 
         # --- CONCURRENCY SETTING ---
-        # Direct local model inference in threads is safe but resource heavy. 
-        # We limit to 4 threads for local to prevent CPU thrashing.
+        # Per-source worker counts: network-bound APIs scale near-linearly
+        # with threads up to their rate limits; local inference stays at 1
+        # to prevent CPU thrashing (CT2 parallelizes internally).
         source = settings.get("source")
-        if source == "local":
-            max_workers = 1
-        elif source == "deepl":
-            max_workers = 16
-        else:
-            max_workers = 4
+        max_workers = MAX_WORKERS_BY_SOURCE.get(source, 4)
+        if source == "local" and self._ct2:
+            # Direct CT2 serializes inference behind _local_infer_lock, so
+            # extra workers overlap zip inflate + BS4 parse with inference
+            # (producer/consumer) instead of thrashing the CPU.
+            max_workers = min(4, os.cpu_count() or 1)
+
+        # Global cap on in-flight API calls, independent of file parallelism
+        self._api_semaphore = threading.Semaphore(max_workers)
 
         try:
             with zipfile.ZipFile(input_path, 'r') as zin:
                 file_list = [n for n in zin.namelist() if n.endswith(('.html', '.xhtml'))]
+                html_files = set(file_list)
                 total_files = len(file_list)
-                
+
+                # Everything that isn't a translated chapter passes through
+                remaining = [i for i in zin.infolist() if i.filename not in html_files]
+
+                # Book-wide dedup pass (skipped in test mode, where only a
+                # handful of elements get translated anyway)
+                if not settings.get("test_mode", False):
+                    self._prescan_and_translate(zin, file_list, settings, max_workers)
+
                 with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zout:
-                    
-                    # Copy non-html
-                    for item in zin.infolist():
-                        if not item.filename.endswith(('.html', '.xhtml')):
-                            zout.writestr(item, zin.read(item.filename))
+
+                    # Copy non-html. Passthrough entries are bitwise
+                    # identical in input and output, so their compressed
+                    # bytes are copied verbatim where possible; the
+                    # fallback stores already-compressed media as-is
+                    # instead of re-deflating it.
+                    for item in remaining:
+                        if copy_raw_zip_entry(zin, zout, item):
+                            continue
+                        # Read before touching compression metadata: zin
+                        # decompresses through this same ZipInfo, and
+                        # flipping it to ZIP_STORED first makes read()
+                        # return raw deflate bytes and fail the CRC check.
+                        data = zin.read(item.filename)
+                        info = copy.copy(item)
+                        if info.filename.lower().endswith(STORED_EXTENSIONS):
+                            info.compress_type = zipfile.ZIP_STORED
+                        zout.writestr(info, data)
                     
                     # Process HTML
                     with ThreadPoolExecutor(max_workers=max_workers) as executor:
                         future_map = {}
                         for fname in file_list:
-                            data = zin.read(fname)
-                            future = executor.submit(self._process_single_file, fname, data, settings)
+                            future = executor.submit(self._process_single_file, fname, zin, settings)
                             future_map[future] = fname
                         
                         completed = 0
@@ -250,11 +729,19 @@ class BackendTranslator:
                 self.log(100, f"Done! Saved to {os.path.basename(output_path)}")
             else:
                 self.log(0, "Stopped by user.")
-                
-            if ext.lower() in ['.mobi', '.azw3'] and os.path.exists(input_path):
-                os.remove(input_path)
 
         except zipfile.BadZipFile:
             self.log(0, "Error: Invalid EPUB file.")
         except Exception as e:
-            self.log(0, f"Critical Error: {e}")
\ No newline at end of file
+            self.log(0, f"Critical Error: {e}")
+        finally:
+            # Intermediates are removed on every exit path (the old code
+            # leaked them when processing raised)
+            for path in temp_paths:
+                try:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path, ignore_errors=True)
+                    elif os.path.exists(path):
+                        os.remove(path)
+                except OSError:
+                    pass
\ No newline at end of file